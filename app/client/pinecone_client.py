@@ -1,22 +1,69 @@
+from collections import OrderedDict
 from datetime import datetime
-from typing import List
+import time
+from typing import List, Optional, Tuple
 from pinecone import Pinecone
 from litellm import embedding
 import pytz
 
 from app.models import MemoryItem
+from app.client.quantized_index import QuantizedIndex, rescore
+
+# Pinecone's upper bound on top_k for queries that include vector values
+MAX_TOP_K_WITH_VALUES = 1000
+# Pinecone's query response size limit, and a conservative estimate of the
+# serialized size of one vector value and of the per-match overhead
+MAX_QUERY_RESPONSE_BYTES = 4 * 1024 * 1024
+BYTES_PER_VALUE = 16
+BYTES_PER_MATCH = 256
+
+def load_top_k(dim: int) -> int:
+    """
+    Largest top_k whose response with vector values fits Pinecone's size limit
+    
+    Args:
+        dim: Vector dimension
+        
+    Returns:
+        int: Number of vectors that can be loaded in one query
+    """
+    return min(MAX_TOP_K_WITH_VALUES, MAX_QUERY_RESPONSE_BYTES // (dim * BYTES_PER_VALUE + BYTES_PER_MATCH))
 
 class PineconeClient:
-    def __init__(self, api_key: str, index_name: str):
+    def __init__(
+        self,
+        api_key: str,
+        index_name: str,
+        quantization: Optional[str] = None,
+        rescore_factor: int = 4,
+        cache_max_users: int = 32,
+        cache_ttl_seconds: float = 300
+    ):
         """
         Initialize PineconeClient
         
         Args:
             api_key: Pinecone API key
             index_name: Pinecone index name
+            quantization: Optional local vector storage type, only "int8" is supported.
+                When set, search generates candidates from a quantized in-memory
+                copy of each user's vectors and rescores them exactly. The copy is
+                only kept in sync with writes made through this client, so this
+                mode assumes a single writer process
+            rescore_factor: Number of candidates fetched for rescoring, as a multiple of top_k
+            cache_max_users: Maximum number of users whose local index is kept in memory
+            cache_ttl_seconds: Seconds after which a user's local index is reloaded from Pinecone
         """
+        if quantization not in (None, "int8"):
+            raise ValueError(f"Unsupported quantization: {quantization}")
         self.pc = Pinecone(api_key=api_key)
         self.index = self.pc.Index(index_name)
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor
+        self.cache_max_users = cache_max_users
+        self.cache_ttl_seconds = cache_ttl_seconds
+        # user_id -> (load time, index); None marks users that could not be loaded
+        self._local_indexes: "OrderedDict[str, Tuple[float, Optional[QuantizedIndex]]]" = OrderedDict()
         
     def _get_embedding(self, text: str) -> List[float]:
         """
@@ -31,6 +78,108 @@ class PineconeClient:
         response = embedding(model='text-embedding-ada-002', input=[text])
         return response.data[0]['embedding']
 
+    def _cached_local_index(self, user_id: str) -> Optional[QuantizedIndex]:
+        """
+        Get a user's local index if it is cached and not expired
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Optional[QuantizedIndex]: The cached index, or None
+        """
+        entry = self._local_indexes.get(user_id)
+        if entry is None:
+            return None
+        loaded_at, local_index = entry
+        if time.monotonic() - loaded_at > self.cache_ttl_seconds:
+            del self._local_indexes[user_id]
+            return None
+        self._local_indexes.move_to_end(user_id)
+        return local_index
+
+    def _get_local_index(self, user_id: str, query_vector: List[float]) -> Optional[QuantizedIndex]:
+        """
+        Get the quantized local index for a user, loading it from Pinecone if needed
+        
+        Args:
+            user_id: User ID
+            query_vector: Any vector of the index dimension, used for the loading query
+            
+        Returns:
+            Optional[QuantizedIndex]: The user's local index, or None if quantization is
+                disabled or the user's vectors could not be loaded completely
+        """
+        if not self.quantization or not user_id:
+            return None
+        if user_id in self._local_indexes:
+            local_index = self._cached_local_index(user_id)
+            if user_id in self._local_indexes:
+                return local_index
+
+        local_index = None
+        try:
+            top_k = load_top_k(len(query_vector))
+            results = self.index.query(
+                vector=query_vector,
+                top_k=top_k,
+                include_values=True,
+                include_metadata=False,
+                filter={"user_id": {"$eq": user_id}}
+            )
+            # A full page may be truncated; never cache a partial index
+            if len(results.matches) < top_k:
+                local_index = QuantizedIndex(dim=len(query_vector))
+                for match in results.matches:
+                    local_index.upsert(match.id, match.values)
+        except Exception as e:
+            # Cache the failure too, so the load is not retried on every search
+            print(f"Error loading local index: {e}")
+
+        self._local_indexes[user_id] = (time.monotonic(), local_index)
+        while len(self._local_indexes) > self.cache_max_users:
+            self._local_indexes.popitem(last=False)
+        return local_index
+
+    def _search_local(self, local_index: QuantizedIndex, query_vector: List[float], threshold: float, top_k: int) -> Optional[List[MemoryItem]]:
+        """
+        Search a quantized local index and rescore candidates with full-precision vectors
+        
+        Args:
+            local_index: The user's quantized local index
+            query_vector: Query embedding
+            threshold: Score threshold, only return results above this score
+            top_k: Maximum number of results to return
+            
+        Returns:
+            Optional[List[MemoryItem]]: List of matching memory items, or None if a top
+                candidate could not be fetched and the Pinecone query should be used instead
+        """
+        candidates = local_index.search(query_vector, top_k * self.rescore_factor)
+        if not candidates:
+            return []
+        fetched = self.index.fetch(ids=[id for id, _ in candidates]).vectors
+        # Recent upserts may not be fetchable yet since Pinecone is eventually consistent
+        if any(id not in fetched for id, _ in candidates[:top_k]):
+            return None
+        ranked = rescore(query_vector, {id: vector.values for id, vector in fetched.items()}, top_k)
+
+        memories = []
+        for id, score in ranked:
+            if score >= threshold:
+                metadata = dict(fetched[id].metadata or {})
+                memory_item = MemoryItem(
+                    id=id,
+                    memory=metadata.pop("content", ""),
+                    hash=metadata.pop("hash", None),
+                    score=score,
+                    created_at=metadata.pop("created_at", None),
+                    updated_at=metadata.pop("updated_at", None),
+                    metadata=metadata
+                )
+                memories.append(memory_item)
+        return memories
+
     def add(self, memory_item: MemoryItem, user_id: str) -> bool:
         """
         Add a memory item to Pinecone
@@ -59,6 +208,9 @@ class PineconeClient:
                 upsert_data["metadata"].update(memory_item.metadata)
                 
             self.index.upsert(vectors=[upsert_data])
+            local_index = self._cached_local_index(user_id)
+            if local_index is not None:
+                local_index.upsert(memory_item.id, vector)
             return True
             
         except Exception as e:
@@ -80,6 +232,15 @@ class PineconeClient:
         """
         try:
             query_vector = self._get_embedding(query)
+
+            local_index = self._get_local_index(user_id, query_vector)
+            if local_index is not None:
+                try:
+                    memories = self._search_local(local_index, query_vector, threshold, top_k)
+                    if memories is not None:
+                        return memories
+                except Exception as e:
+                    print(f"Error searching local index, falling back to Pinecone query: {e}")
             
             filter = None
             if user_id:
@@ -157,7 +318,7 @@ class PineconeClient:
             return []
 
 
-    def update(self, id: str, memory: str) -> bool:
+    def update(self, id: str, memory: str, user_id: str) -> bool:
         """
         Update a memory item by ID
         
@@ -177,6 +338,9 @@ class PineconeClient:
                 values=vector, 
                 set_metadata={"content": memory}
             )
+            local_index = self._cached_local_index(user_id)
+            if local_index is not None:
+                local_index.upsert(id, vector)
             return True
             
         except Exception as e:
@@ -195,6 +359,9 @@ class PineconeClient:
         """
         try:
             self.index.delete(ids=[id])
+            for _, local_index in self._local_indexes.values():
+                if local_index is not None:
+                    local_index.remove(id)
             return True
             
         except Exception as e:
@@ -217,6 +384,7 @@ class PineconeClient:
             }
             
             self.index.delete(filter=filter)
+            self._local_indexes.pop(user_id, None)
             return True
             
         except Exception as e:
@@ -0,0 +1,162 @@
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+
+
+class QuantizedIndex:
+    def __init__(self, dim: int, initial_capacity: int = 64):
+        """
+        Initialize an in-memory index of int8-quantized, unit-normalized vectors
+
+        Vectors are stored row-wise in one contiguous array as int8 codes with
+        a per-vector float32 scale. Scores are approximate cosine similarities
+        meant for candidate generation; exact scores should be recomputed from
+        the full-precision vectors. Storage is a quarter of float32; scans are
+        somewhat slower than a float32 scan since NumPy has no int8 BLAS.
+
+        Args:
+            dim: Vector dimension
+            initial_capacity: Number of rows to preallocate
+        """
+        self.dim = dim
+        self._codes = np.zeros((max(initial_capacity, 1), dim), dtype=np.int8)
+        self._scales = np.ones(max(initial_capacity, 1), dtype=np.float32)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._rows
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes allocated for codes and scales, including spare capacity
+        """
+        return self._codes.nbytes + self._scales.nbytes
+
+    def _quantize(self, vector: Sequence[float]) -> Tuple[np.ndarray, float]:
+        v = np.asarray(vector, dtype=np.float32)
+        if v.shape != (self.dim,):
+            raise ValueError(f"Expected vector of dimension {self.dim}, got {v.shape}")
+        norm = np.linalg.norm(v)
+        if norm > 0:
+            v = v / norm
+        scale = float(np.abs(v).max()) / 127.0
+        if scale == 0.0:
+            return np.zeros(self.dim, dtype=np.int8), 1.0
+        codes = np.clip(np.rint(v / scale), -127, 127).astype(np.int8)
+        return codes, scale
+
+    def _grow(self):
+        capacity = self._codes.shape[0] * 2
+        codes = np.zeros((capacity, self.dim), dtype=self._codes.dtype)
+        codes[:len(self._ids)] = self._codes[:len(self._ids)]
+        scales = np.ones(capacity, dtype=np.float32)
+        scales[:len(self._ids)] = self._scales[:len(self._ids)]
+        self._codes = codes
+        self._scales = scales
+
+    def upsert(self, id: str, vector: Sequence[float]):
+        """
+        Add a vector, or replace it if the ID already exists
+
+        Args:
+            id: Vector ID
+            vector: Full-precision vector
+        """
+        codes, scale = self._quantize(vector)
+        row = self._rows.get(id)
+        if row is None:
+            if len(self._ids) == self._codes.shape[0]:
+                self._grow()
+            row = len(self._ids)
+            self._ids.append(id)
+            self._rows[id] = row
+        self._codes[row] = codes
+        self._scales[row] = scale
+
+    def remove(self, id: str) -> bool:
+        """
+        Remove a vector by ID
+
+        Args:
+            id: Vector ID
+
+        Returns:
+            bool: True if the vector was present, False otherwise
+        """
+        row = self._rows.pop(id, None)
+        if row is None:
+            return False
+        last = len(self._ids) - 1
+        if row != last:
+            # Move the last row into the hole to keep storage contiguous
+            last_id = self._ids[last]
+            self._codes[row] = self._codes[last]
+            self._scales[row] = self._scales[last]
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+        self._ids.pop()
+        return True
+
+    def search(self, query: Sequence[float], top_k: int, chunk_size: int = 256) -> List[Tuple[str, float]]:
+        """
+        Find the vectors with the highest approximate cosine similarity
+
+        Args:
+            query: Full-precision query vector
+            top_k: Maximum number of results to return
+            chunk_size: Rows dequantized per block, bounds temporary memory
+
+        Returns:
+            List[Tuple[str, float]]: (id, approximate score) pairs, best first
+        """
+        n = len(self._ids)
+        if n == 0 or top_k <= 0:
+            return []
+        q = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm > 0:
+            q = q / norm
+
+        # Dequantize into one small reused buffer that stays in cache, so only
+        # the compact codes are streamed from memory
+        scores = np.empty(n, dtype=np.float32)
+        buffer = np.empty((min(chunk_size, n), self.dim), dtype=np.float32)
+        for start in range(0, n, chunk_size):
+            end = min(start + chunk_size, n)
+            block = buffer[:end - start]
+            np.copyto(block, self._codes[start:end], casting="unsafe")
+            np.dot(block, q, out=scores[start:end])
+        scores *= self._scales[:n]
+
+        k = min(top_k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+
+def rescore(query: Sequence[float], candidates: Dict[str, Sequence[float]], top_k: int) -> List[Tuple[str, float]]:
+    """
+    Rank candidates by exact cosine similarity against full-precision vectors
+
+    Args:
+        query: Full-precision query vector
+        candidates: Mapping of candidate ID to its full-precision vector
+        top_k: Maximum number of results to return
+
+    Returns:
+        List[Tuple[str, float]]: (id, exact score) pairs, best first
+    """
+    if not candidates or top_k <= 0:
+        return []
+    ids = list(candidates.keys())
+    q = np.asarray(query, dtype=np.float32)
+    vectors = np.asarray([candidates[id] for id in ids], dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(q)
+    norms[norms == 0] = 1.0
+    scores = (vectors @ q) / norms
+    order = np.argsort(-scores)[:top_k]
+    return [(ids[i], float(scores[i])) for i in order]
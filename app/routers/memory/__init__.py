@@ -12,7 +12,14 @@ from app.logger import logger
 from app.client.opensearch_client import OpensearchClient
 from config import settings
 
-client = PineconeClient(api_key=settings.PINECONE_API_KEY, index_name=settings.PINECONE_INDEX_NAME)
+client = PineconeClient(
+    api_key=settings.PINECONE_API_KEY,
+    index_name=settings.PINECONE_INDEX_NAME,
+    quantization=settings.VECTOR_QUANTIZATION,
+    rescore_factor=settings.VECTOR_RESCORE_FACTOR,
+    cache_max_users=settings.VECTOR_CACHE_MAX_USERS,
+    cache_ttl_seconds=settings.VECTOR_CACHE_TTL_SECONDS
+)
 
 class MemoryRequest(BaseModel):
     messages: list[Message]
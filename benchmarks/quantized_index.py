@@ -0,0 +1,80 @@
+"""
+Recall/latency benchmark for QuantizedIndex against exact float32 search.
+
+This measures local memory and CPU time only. The service has no local
+float32 scan: without quantization each search is one Pinecone query, and
+with it each search is a Pinecone fetch plus occasional full loads, which
+this benchmark does not include.
+
+Run from the repository root:
+
+    python -m benchmarks.quantized_index --n 20000 --queries 200
+"""
+import argparse
+import time
+import numpy as np
+
+from app.client.quantized_index import QuantizedIndex, rescore
+
+
+def make_vectors(n: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    # Clustered data is closer to real embeddings than isotropic noise
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n)
+    vectors = centers[labels] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    data = make_vectors(args.n, args.dim, clusters=64, rng=rng)
+    queries = make_vectors(args.queries, args.dim, clusters=64, rng=rng)
+    ids = [str(i) for i in range(args.n)]
+
+    exact = []
+    start = time.perf_counter()
+    for q in queries:
+        scores = data @ q
+        # Same top-k selection as QuantizedIndex.search, so only the scan differs
+        top = np.argpartition(-scores, args.top_k - 1)[:args.top_k]
+        top = top[np.argsort(-scores[top])]
+        exact.append(set(top.astype(str)))
+    exact_ms = (time.perf_counter() - start) * 1000 / args.queries
+    print(f"float32  bytes={data.nbytes:>12,}  total={exact_ms:7.3f} ms/query")
+
+    index = QuantizedIndex(dim=args.dim, initial_capacity=args.n)
+    for id, vector in zip(ids, data):
+        index.upsert(id, vector)
+
+    hits = 0
+    scan_time = 0.0
+    rescore_time = 0.0
+    for q, truth in zip(queries, exact):
+        start = time.perf_counter()
+        candidates = index.search(q, args.top_k * args.rescore_factor)
+        scan_time += time.perf_counter() - start
+        start = time.perf_counter()
+        ranked = rescore(q, {id: data[int(id)] for id, _ in candidates}, args.top_k)
+        rescore_time += time.perf_counter() - start
+        hits += len(truth & {id for id, _ in ranked})
+
+    recall = hits / (args.queries * args.top_k)
+    scan_ms = scan_time * 1000 / args.queries
+    rescore_ms = rescore_time * 1000 / args.queries
+    print(
+        f"int8     bytes={index.nbytes:>12,}  total={scan_ms + rescore_ms:7.3f} ms/query"
+        f"  (scan={scan_ms:.3f}, rescore={rescore_ms:.3f})  recall@{args.top_k}={recall:.4f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,6 +9,10 @@ class Settings(BaseSettings):
     LANGFUSE_PUBLIC_KEY: str
     LANGFUSE_SECRET_KEY: str
     LANGFUSE_HOST: str
+    VECTOR_QUANTIZATION: Optional[Literal["int8"]] = None
+    VECTOR_RESCORE_FACTOR: int = Field(4, ge=1)
+    VECTOR_CACHE_MAX_USERS: int = Field(32, ge=1)
+    VECTOR_CACHE_TTL_SECONDS: float = Field(300, gt=0)
     
     class Config:
         env_file = ".env"
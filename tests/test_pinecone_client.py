@@ -0,0 +1,225 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.client import pinecone_client
+from app.client.pinecone_client import PineconeClient
+from app.models import MemoryItem
+
+EMBEDDINGS = {
+    "apple": [1, 0, 0, 0],
+    "banana": [0, 1, 0, 0],
+    "cherry": [0, 0, 1, 0],
+    "date": [0, 0, 0, 1],
+}
+
+
+class FakeIndex:
+    def __init__(self):
+        self.vectors = {}
+        self.loads = 0
+        self.queries = 0
+        self.fail_loads = False
+        self.unfetchable = set()
+
+    def query(self, vector, top_k, include_values=False, include_metadata=False, filter=None):
+        if include_values:
+            self.loads += 1
+            if self.fail_loads:
+                raise RuntimeError("response too large")
+        else:
+            self.queries += 1
+        user_id = filter["user_id"]["$eq"]
+        matches = []
+        for id, item in self.vectors.items():
+            if item["metadata"]["user_id"] == user_id:
+                score = float(np.dot(vector, item["values"]))
+                matches.append(SimpleNamespace(
+                    id=id,
+                    score=score,
+                    values=item["values"] if include_values else None,
+                    metadata=dict(item["metadata"]) if include_metadata else None
+                ))
+        matches.sort(key=lambda match: -match.score)
+        return SimpleNamespace(matches=matches[:top_k])
+
+    def fetch(self, ids):
+        return SimpleNamespace(vectors={
+            id: SimpleNamespace(values=self.vectors[id]["values"], metadata=dict(self.vectors[id]["metadata"]))
+            for id in ids if id in self.vectors and id not in self.unfetchable
+        })
+
+    def upsert(self, vectors):
+        for vector in vectors:
+            self.vectors[vector["id"]] = {"values": vector["values"], "metadata": dict(vector["metadata"])}
+
+    def update(self, id, values, set_metadata):
+        self.vectors[id]["values"] = values
+        self.vectors[id]["metadata"].update(set_metadata)
+
+    def delete(self, ids=None, filter=None):
+        if ids:
+            for id in ids:
+                self.vectors.pop(id, None)
+        if filter:
+            user_id = filter["user_id"]["$eq"]
+            for id in [id for id, item in self.vectors.items() if item["metadata"]["user_id"] == user_id]:
+                del self.vectors[id]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = FakeIndex()
+    monkeypatch.setattr(pinecone_client, "Pinecone", lambda api_key: SimpleNamespace(Index=lambda name: index))
+    monkeypatch.setattr(PineconeClient, "_get_embedding", lambda self, text: EMBEDDINGS[text])
+    return index
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(pinecone_client.time, "monotonic", clock)
+    return clock
+
+
+def make_client(**kwargs):
+    return PineconeClient(api_key="key", index_name="index", quantization="int8", **kwargs)
+
+
+def add(client, id, text, user_id="u1"):
+    assert client.add(MemoryItem(id=id, memory=text), user_id=user_id)
+
+
+def search_ids(client, text, user_id="u1"):
+    return [memory.id for memory in client.search(text, user_id=user_id)]
+
+
+def test_invalid_quantization_rejected(index):
+    with pytest.raises(ValueError):
+        PineconeClient(api_key="key", index_name="index", quantization="float16")
+
+
+def test_search_loads_once_and_rescores(index, clock):
+    client = make_client()
+    add(client, "1", "apple")
+    add(client, "2", "banana")
+
+    memories = client.search("apple", user_id="u1")
+    assert [memory.id for memory in memories] == ["1"]
+    assert memories[0].memory == "apple"
+    assert memories[0].score == pytest.approx(1.0)
+    assert search_ids(client, "banana") == ["2"]
+    assert index.loads == 1
+    assert index.queries == 0
+
+
+def test_writes_keep_local_index_in_sync(index, clock):
+    client = make_client()
+    add(client, "1", "apple")
+    assert search_ids(client, "apple") == ["1"]
+
+    add(client, "2", "banana")
+    assert search_ids(client, "banana") == ["2"]
+
+    assert client.update("2", "cherry", user_id="u1")
+    assert search_ids(client, "cherry") == ["2"]
+    assert search_ids(client, "banana") == []
+
+    assert client.delete_by_id("1")
+    assert search_ids(client, "apple") == []
+    assert index.loads == 1
+
+    assert client.delete_by_user_id("u1")
+    add(client, "3", "date")
+    assert search_ids(client, "date") == ["3"]
+    assert index.loads == 2
+    assert index.queries == 0
+
+
+def test_expired_index_is_reloaded(index, clock):
+    client = make_client(cache_ttl_seconds=60)
+    add(client, "1", "apple")
+    search_ids(client, "apple")
+
+    # A write from another process only becomes visible after the TTL
+    index.upsert([{"id": "2", "values": EMBEDDINGS["banana"], "metadata": {"user_id": "u1", "content": "banana"}}])
+    assert search_ids(client, "banana") == []
+
+    clock.now += 61
+    assert search_ids(client, "banana") == ["2"]
+    assert index.loads == 2
+
+
+def test_least_recently_used_index_is_evicted(index, clock):
+    client = make_client(cache_max_users=2)
+    add(client, "1", "apple", user_id="u1")
+    add(client, "2", "banana", user_id="u2")
+    add(client, "3", "cherry", user_id="u3")
+
+    search_ids(client, "apple", user_id="u1")
+    search_ids(client, "banana", user_id="u2")
+    search_ids(client, "apple", user_id="u1")
+    search_ids(client, "cherry", user_id="u3")
+    assert index.loads == 3
+
+    # u2 was least recently used and was evicted; u1 is still cached
+    search_ids(client, "apple", user_id="u1")
+    assert index.loads == 3
+    assert search_ids(client, "banana", user_id="u2") == ["2"]
+    assert index.loads == 4
+
+
+def test_large_user_uses_pinecone_query(index, clock, monkeypatch):
+    monkeypatch.setattr(pinecone_client, "MAX_TOP_K_WITH_VALUES", 2)
+    client = make_client()
+    add(client, "1", "apple")
+    add(client, "2", "banana")
+
+    assert search_ids(client, "apple") == ["1"]
+    assert search_ids(client, "banana") == ["2"]
+    assert index.loads == 1
+    assert index.queries == 2
+
+
+def test_failed_load_falls_back_and_is_not_retried(index, clock):
+    client = make_client()
+    add(client, "1", "apple")
+    index.fail_loads = True
+
+    assert search_ids(client, "apple") == ["1"]
+    assert search_ids(client, "apple") == ["1"]
+    assert index.loads == 1
+    assert index.queries == 2
+
+
+def test_unfetchable_candidate_falls_back_to_pinecone_query(index, clock):
+    client = make_client()
+    add(client, "1", "apple")
+    search_ids(client, "apple")
+
+    add(client, "2", "banana")
+    index.unfetchable.add("2")
+    assert search_ids(client, "banana") == ["2"]
+    assert index.queries == 1
+
+
+def test_missing_metadata_is_accepted(index, clock):
+    client = make_client()
+    add(client, "1", "apple")
+    search_ids(client, "apple")
+    fetch = index.fetch
+    index.fetch = lambda ids: SimpleNamespace(vectors={
+        id: SimpleNamespace(values=vector.values, metadata=None) for id, vector in fetch(ids).vectors.items()
+    })
+
+    memories = client.search("apple", user_id="u1")
+    assert [(memory.id, memory.memory) for memory in memories] == [("1", "")]
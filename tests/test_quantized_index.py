@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from app.client.quantized_index import QuantizedIndex, rescore
+
+
+def unit(vector):
+    v = np.asarray(vector, dtype=np.float32)
+    return v / np.linalg.norm(v)
+
+
+def test_remove_moves_last_row_into_hole():
+    index = QuantizedIndex(dim=3)
+    index.upsert("a", [1, 0, 0])
+    index.upsert("b", [0, 1, 0])
+    index.upsert("c", [0, 0, 1])
+
+    assert index.remove("a")
+    assert not index.remove("a")
+    assert len(index) == 2
+    assert "a" not in index
+    assert "b" in index and "c" in index
+    # "c" was the last row and now occupies the removed row
+    assert index.search([0, 0, 1], 1)[0] == ("c", pytest.approx(1.0, abs=0.01))
+    assert index.search([0, 1, 0], 1)[0] == ("b", pytest.approx(1.0, abs=0.01))
+    assert {id for id, _ in index.search([1, 1, 1], 3)} == {"b", "c"}
+
+    # The moved row can itself be removed and replaced
+    assert index.remove("c")
+    index.upsert("d", [1, 0, 0])
+    assert len(index) == 2
+    assert index.search([1, 0, 0], 1)[0][0] == "d"
+
+
+def test_grow_keeps_existing_rows():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((10, 8))
+    index = QuantizedIndex(dim=8, initial_capacity=1)
+    for i, vector in enumerate(vectors):
+        index.upsert(str(i), vector)
+
+    assert len(index) == 10
+    for i, vector in enumerate(vectors):
+        id, score = index.search(vector, 1)[0]
+        assert id == str(i)
+        assert score == pytest.approx(1.0, abs=0.02)
+
+
+def test_upsert_existing_id_replaces_vector():
+    index = QuantizedIndex(dim=2)
+    index.upsert("a", [1, 0])
+    index.upsert("a", [0, 1])
+
+    assert len(index) == 1
+    id, score = index.search([0, 1], 1)[0]
+    assert id == "a"
+    assert score == pytest.approx(1.0, abs=0.01)
+
+
+def test_zero_vector_int8():
+    index = QuantizedIndex(dim=3)
+    index.upsert("zero", [0, 0, 0])
+    index.upsert("x", [1, 0, 0])
+
+    results = dict(index.search([1, 0, 0], 2))
+    assert results["zero"] == 0.0
+    assert results["x"] == pytest.approx(1.0, abs=0.01)
+
+
+def test_search_scores_close_to_exact():
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((50, 64))
+    query = rng.standard_normal(64)
+    index = QuantizedIndex(dim=64, initial_capacity=4)
+    for i, vector in enumerate(vectors):
+        index.upsert(str(i), vector)
+
+    exact = np.array([unit(v) @ unit(query) for v in vectors])
+    for id, score in index.search(query, 50, chunk_size=7):
+        assert score == pytest.approx(exact[int(id)], abs=0.02)
+
+
+def test_rescore_matches_brute_force_cosine():
+    rng = np.random.default_rng(2)
+    vectors = rng.standard_normal((20, 16)) * rng.uniform(0.1, 10, size=(20, 1))
+    query = rng.standard_normal(16)
+    candidates = {str(i): vector.tolist() for i, vector in enumerate(vectors)}
+
+    exact = [(str(i), float(unit(v) @ unit(query))) for i, v in enumerate(vectors)]
+    exact.sort(key=lambda item: -item[1])
+
+    ranked = rescore(query, candidates, 5)
+    assert [id for id, _ in ranked] == [id for id, _ in exact[:5]]
+    for (_, score), (_, expected) in zip(ranked, exact):
+        assert score == pytest.approx(expected, abs=1e-5)